@@ -454,6 +454,10 @@ industry_regions = {
     }
 }
 
+# Number of most recent chat messages rendered on each rerun; the full history is
+# kept in session state for context and download
+CHAT_DISPLAY_LIMIT = 50
+
 # Initialize session state variables
 if 'chat_history' not in st.session_state:
     st.session_state.chat_history = [
@@ -509,13 +513,20 @@ if st.session_state.show_homepage:
         border: none !important;
         border-radius: 14px !important;
         box-shadow: 0 8px 30px rgba(30, 144, 255, 0.4) !important;
-        transition: all 0.3s ease !important;
         letter-spacing: 0.5px !important;
     }
     div[data-testid="stButton"] > button[kind="primary"]:hover {
-        transform: translateY(-3px) !important;
         box-shadow: 0 14px 40px rgba(30, 144, 255, 0.55) !important;
     }
+    /* Lift effect on hover, only for users who have not asked for reduced motion */
+    @media (prefers-reduced-motion: no-preference) {
+        div[data-testid="stButton"] > button[kind="primary"] {
+            transition: all 0.3s ease !important;
+        }
+        div[data-testid="stButton"] > button[kind="primary"]:hover {
+            transform: translateY(-3px) !important;
+        }
+    }
     </style>
     """, unsafe_allow_html=True)
     
@@ -815,8 +826,8 @@ st.markdown('<div class="chat-container">', unsafe_allow_html=True)
 
 # Display existing chat messages (skip the first welcome message)
 if st.session_state.chat_history:
-    # Skip the first welcome message by starting from index 1
-    for message in st.session_state.chat_history[1:]:
+    # Skip the first welcome message and only render the most recent messages
+    for message in st.session_state.chat_history[1:][-CHAT_DISPLAY_LIMIT:]:
         if message["role"] == "user":
             st.markdown(f"""
             <div class="chat-message user-message">
@@ -863,6 +874,9 @@ if "thinking" in st.session_state and st.session_state.thinking:
     </div>
     """, unsafe_allow_html=True)
 
+# Placeholder that the streamed response is written into while thinking
+stream_placeholder = st.empty()
+
 st.markdown('</div>', unsafe_allow_html=True)
 
 # Chat input - use follow-up suggestion from the response as the placeholder if available
@@ -1106,56 +1120,18 @@ if st.session_state.thinking and not st.session_state.query_processed:
             for msg in st.session_state.chat_history[1:-1]  # Skip welcome message and exclude latest user message
         ]
         
-        # Import for timeout handling
-        import threading
-        import queue
-        
-        response_queue = queue.Queue()
-        
-        def get_response():
-            try:
-                # Use our improved OpenAI helper to generate a response
-                response = openai_helper.generate_climate_response(user_query, messages)
-                response_queue.put(response)
-            except Exception as e:
-                response_queue.put(e)
-        
-        # Create and start thread
-        response_thread = threading.Thread(target=get_response)
-        response_thread.daemon = True
-        response_thread.start()
-        
-        # Wait for the thread to complete or timeout
-        response_thread.join(40)  # 40 second total timeout
+        # Stream the response into the chat area as it is generated
+        with stream_placeholder.container():
+            response_content = st.write_stream(
+                openai_helper.generate_climate_response_stream(user_query, messages)
+            )
         
-        if response_thread.is_alive():
-            print("Response generation timed out after 40 seconds")
-            response_content = fallback_response(user_query)
-            # Add a note about the timeout
-            response_content = "I apologize for the delay. " + response_content
+        # Log success or failure
+        if response_content:
+            print("Successfully generated response using OpenAI API")
         else:
-            # Get response from queue
-            try:
-                response_or_error = response_queue.get(block=False)
-                
-                # Check if we got an error
-                if isinstance(response_or_error, Exception):
-                    raise response_or_error
-                    
-                # Otherwise, we got a response
-                response_content = response_or_error
-                
-                # Log success or failure
-                if response_content:
-                    print("Successfully generated response using OpenAI API")
-                else:
-                    print("Failed to generate response with OpenAI API, using fallback")
-                    # If our OpenAI helper returns None, use the fallback response
-                    response_content = fallback_response(user_query)
-            except queue.Empty:
-                # This shouldn't happen, but just in case
-                print("Queue was empty - unexpected error")
-                response_content = fallback_response(user_query)
+            print("Failed to generate response with OpenAI API, using fallback")
+            response_content = fallback_response(user_query)
             
     except Exception as e:
         # Something went wrong, provide an error message with details
@@ -1202,39 +1178,44 @@ if st.session_state.thinking and not st.session_state.query_processed:
 # Import geopy for geocoding city names to coordinates
 from geopy.geocoders import Nominatim
 
-# Function to convert city name to coordinates
-def get_city_coordinates(city_name):
-    try:
-        # Create a more robust user agent string
-        geolocator = Nominatim(user_agent="climate_copilot_application")
-        
-        # Try to geocode with the original city name
-        location = geolocator.geocode(city_name, timeout=10, exactly_one=True)
+# Geocode a city name, cached so reruns with the same city skip the network lookups;
+# errors propagate so a failed lookup is retried on the next rerun instead of cached
+@st.cache_data(ttl=3600, show_spinner=False)
+def _geocode_city(city_name):
+    # Create a more robust user agent string
+    geolocator = Nominatim(user_agent="climate_copilot_application")
+    
+    # Try to geocode with the original city name
+    location = geolocator.geocode(city_name, timeout=10, exactly_one=True)
+    
+    # If successful, return the coordinates
+    if location:
+        return location.latitude, location.longitude
         
-        # If successful, return the coordinates
+    # If not successful, try some alternative formats
+    # Try without commas
+    if "," in city_name:
+        clean_name = city_name.replace(",", " ")
+        location = geolocator.geocode(clean_name, timeout=10, exactly_one=True)
         if location:
             return location.latitude, location.longitude
-            
-        # If not successful, try some alternative formats
-        # Try without commas
-        if "," in city_name:
-            clean_name = city_name.replace(",", " ")
-            location = geolocator.geocode(clean_name, timeout=10, exactly_one=True)
+    
+    # Try adding explicit country if not present
+    if "," not in city_name and " " in city_name:
+        # This might be a city without a country specified
+        for country in ["USA", "France", "UK", "Germany", "Japan", "Canada", "Australia"]:
+            test_name = f"{city_name}, {country}"
+            location = geolocator.geocode(test_name, timeout=10, exactly_one=True)
             if location:
                 return location.latitude, location.longitude
-        
-        # Try adding explicit country if not present
-        if "," not in city_name and " " in city_name:
-            # This might be a city without a country specified
-            for country in ["USA", "France", "UK", "Germany", "Japan", "Canada", "Australia"]:
-                test_name = f"{city_name}, {country}"
-                location = geolocator.geocode(test_name, timeout=10, exactly_one=True)
-                if location:
-                    return location.latitude, location.longitude
-        
-        # If all attempts fail, return None
-        return None, None
-        
+    
+    # If all attempts fail, return None
+    return None, None
+
+# Function to convert city name to coordinates
+def get_city_coordinates(city_name):
+    try:
+        return _geocode_city(city_name)
     except Exception as e:
         st.error(f"Error geocoding city: {str(e)}")
         return None, None
@@ -3289,8 +3270,8 @@ if st.session_state.chat_history:
     chat_container = st.container()
     
     with chat_container:
-        # Skip the first welcome message in chat history display
-        for message in st.session_state.chat_history[1:]:
+        # Skip the first welcome message and only render the most recent messages
+        for message in st.session_state.chat_history[1:][-CHAT_DISPLAY_LIMIT:]:
             if message["role"] == "user":
                 st.markdown(f"**You:** {message['content']}")
             else:
@@ -6,18 +6,188 @@ manage API call retries, and handle errors gracefully.
 """
 
 import os
+import re
 import time
+import random
 import sys
-from openai import OpenAI, APIError, RateLimitError, APIConnectionError, AuthenticationError
+import asyncio
+import functools
+import hashlib
+import threading
+import logging
+import atexit
+import httpx
+import orjson
+from openai import (OpenAI, AsyncOpenAI, DefaultAioHttpClient, APIError, RateLimitError, AuthenticationError,
+                    APIConnectionError, InternalServerError)
+
+logger = logging.getLogger(__name__)
 
 # Maximum number of retries for API calls
 MAX_RETRIES = 3
-# Base delay for exponential backoff in seconds
+# Base and maximum delay for retry backoff in seconds
 BASE_DELAY = 1
+MAX_DELAY = 30
+# Sustained request rate and burst size admitted by the rate limiter. The
+# defaults match OpenAI's usage tier 1 limit for gpt-4o (500 requests per
+# minute); set these to the limits of the account's tier.
+REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500"))
+RATE_LIMIT_BURST = int(os.getenv("OPENAI_RATE_LIMIT_BURST", "50"))
+# Timeout for a single API request in seconds
+REQUEST_TIMEOUT = 15
+# Overall time allowed for a response, including retries, in seconds
+RESPONSE_DEADLINE = 40
+
+# Semantic cache settings: maximum embedding distance for a cache hit and entry
+# lifetime in seconds. Embeddings are unit-normalized, so Chroma's squared L2
+# distance is 2 - 2 * cosine similarity (0.1 means cosine similarity >= 0.95).
+SEMANTIC_CACHE_DIR = "./cece_semcache"
+SEMANTIC_CACHE_THRESHOLD = 0.1
+SEMANTIC_CACHE_TTL = 24 * 60 * 60
+
+# Lazily initialized Chroma collection (False means initialization failed)
+_semantic_cache = None
+_semantic_cache_lock = threading.Lock()
+
+def get_semantic_cache():
+    """
+    Get the Chroma collection used to cache responses by query similarity
+    
+    The collection needs chromadb and langchain-community, which are optional;
+    without them the cache is disabled and every query goes to the API.
+    
+    Returns:
+        Chroma vector store or None if the embedding stack is unavailable
+    """
+    global _semantic_cache
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None:
+                try:
+                    from langchain.vectorstores import Chroma
+                    from rag_query import get_embeddings
+                    
+                    _semantic_cache = Chroma(
+                        collection_name="cece_semcache",
+                        embedding_function=get_embeddings(),
+                        persist_directory=SEMANTIC_CACHE_DIR
+                    )
+                except Exception as e:
+                    logger.warning("Semantic cache disabled: %s", e)
+                    _semantic_cache = False
+    
+    return _semantic_cache or None
+
+def semantic_cache_lookup(query):
+    """
+    Look up a cached response for a query or a close paraphrase of it
+    
+    Args:
+        query: User's query text
+    
+    Returns:
+        Cached response text or None on a miss
+    """
+    cache = get_semantic_cache()
+    if cache is None:
+        return None
+    
+    try:
+        # Only entries younger than the TTL are candidates for the nearest match
+        results = cache.similarity_search_with_score(
+            query, k=1, filter={"created_at": {"$gte": time.time() - SEMANTIC_CACHE_TTL}}
+        )
+    except Exception as e:
+        logger.debug("Semantic cache lookup failed: %s", e)
+        return None
+    
+    if not results:
+        return None
+    
+    doc, distance = results[0]
+    if distance >= SEMANTIC_CACHE_THRESHOLD:
+        return None
+    
+    return doc.metadata.get("response")
+
+def semantic_cache_store(query, response):
+    """
+    Store a response in the semantic cache, dropping expired entries
+    
+    Args:
+        query: User's query text
+        response: Response text returned by the API
+    """
+    cache = get_semantic_cache()
+    if cache is None:
+        return
+    
+    try:
+        now = time.time()
+        expired = cache.get(where={"created_at": {"$lt": now - SEMANTIC_CACHE_TTL}})["ids"]
+        if expired:
+            cache.delete(ids=expired)
+        cache.add_texts([query], metadatas=[{"response": response, "created_at": now}])
+    except Exception as e:
+        logger.debug("Semantic cache store failed: %s", e)
+
+# Messages shown to the user for each kind of API failure
+API_ERROR_RESPONSES = {
+    "authentication": "I'm sorry, but there was an authentication error with the OpenAI API. Please check that your API key is valid.",
+    "quota": "I'm sorry, but the OpenAI API quota has been exceeded. Please check your API key's billing status or try again later.",
+    "api": "I'm sorry, but there was an error communicating with the OpenAI API. Please try again later.",
+    "unexpected": "I'm sorry, but there was an unexpected error when trying to generate a response. Please try again later."
+}
+
+class ChatCompletionError(Exception):
+    """
+    Raised when a chat completion fails for good
+    
+    The reason is a key of API_ERROR_RESPONSES, so callers can show the user
+    a matching message without mistaking it for a model response.
+    """
+    
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+# Connection pool limits shared by the sync and async clients
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+@functools.lru_cache(maxsize=4)
+def _build_openai_client(api_key):
+    return OpenAI(
+        api_key=api_key,
+        http_client=httpx.Client(limits=HTTP_LIMITS, timeout=REQUEST_TIMEOUT)
+    )
+
+@functools.lru_cache(maxsize=4)
+def _build_async_openai_client(api_key):
+    # Retries are handled by _chat_completion_async, not by the SDK.
+    # The aiohttp transport scales far better than httpx under many concurrent calls.
+    client = AsyncOpenAI(
+        api_key=api_key,
+        max_retries=0,
+        http_client=DefaultAioHttpClient(limits=HTTP_LIMITS, timeout=REQUEST_TIMEOUT)
+    )
+    atexit.register(_close_async_openai_client, client)
+    return client
+
+def _close_async_openai_client(client):
+    """Close an async client's aiohttp session on the loop that owns it (run at exit)"""
+    loop = _event_loop
+    if loop is None or not loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(client.close(), loop).result(timeout=5)
+    except Exception as e:
+        logger.debug("Closing the async OpenAI client failed: %r", e)
 
 def get_openai_client():
     """
-    Get an initialized OpenAI client using API key from environment
+    Get the shared OpenAI client using API key from environment
+    
+    Clients are cached per key so repeat calls reuse keep-alive connections.
     
     Returns:
         OpenAI client or None if API key is missing
@@ -26,12 +196,201 @@ def get_openai_client():
     if not api_key:
         return None
     
-    return OpenAI(api_key=api_key)
+    return _build_openai_client(api_key)
 
-def chat_completion(messages, model="gpt-4o", max_tokens=500, temperature=0.7, 
-                   retries=MAX_RETRIES, system_message=None):
+def get_async_openai_client():
     """
-    Get a completion from OpenAI Chat API with retry logic
+    Get the shared AsyncOpenAI client using API key from environment
+    
+    Returns:
+        AsyncOpenAI client or None if API key is missing
+    """
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    
+    return _build_async_openai_client(api_key)
+
+class TokenBucket:
+    """
+    Token bucket that admits API requests at a steady rate with bursts
+    
+    All API calls run on the shared background event loop, so one instance
+    rate-limits every caller in the process.
+    """
+    
+    def __init__(self, rate, burst):
+        """
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens held
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.timestamp = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def take(self):
+        """Wait until a token is available and consume it"""
+        async with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.timestamp) * self.rate)
+            self.timestamp = now
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 0
+                self.timestamp = time.monotonic()
+            else:
+                self.tokens -= 1
+
+_rate_limiter = TokenBucket(rate=REQUESTS_PER_MINUTE / 60, burst=RATE_LIMIT_BURST)
+
+def get_retry_delay(previous_delay, error=None):
+    """
+    Compute the next retry delay using decorrelated jitter
+    
+    Honors the server's Retry-After header when the error carries one.
+    
+    Args:
+        previous_delay: Delay used before the previous attempt (0 for none)
+        error: Exception raised by the failed attempt (optional)
+    
+    Returns:
+        Delay in seconds
+    """
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(MAX_DELAY, float(retry_after))
+        except ValueError:
+            pass
+    
+    return random.uniform(BASE_DELAY, min(MAX_DELAY, max(BASE_DELAY, previous_delay * 3)))
+
+# Event loop that owns the async client's connections
+_event_loop = None
+_event_loop_lock = threading.Lock()
+
+def get_event_loop():
+    """
+    Get the background event loop that runs all async API calls
+    
+    The loop lives for the whole process so the async client's connection
+    pool stays valid between calls (asyncio.run would close it every time).
+    
+    Returns:
+        Running asyncio event loop
+    """
+    global _event_loop
+    with _event_loop_lock:
+        if _event_loop is None:
+            _event_loop = asyncio.new_event_loop()
+            threading.Thread(target=_event_loop.run_forever, daemon=True).start()
+    
+    return _event_loop
+
+# Futures for chat completions currently in flight, keyed by get_request_key
+_inflight_requests = {}
+
+def get_request_key(model, messages, max_tokens, temperature):
+    """
+    Build a stable key identifying a chat completion request
+    
+    Returns:
+        SHA-256 hex digest of the canonical JSON form of the request
+    """
+    request = {"model": model, "messages": messages, "max_tokens": max_tokens, "temperature": temperature}
+    return hashlib.sha256(orjson.dumps(request, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+async def _join_inflight_request(future):
+    """
+    Wait for an identical request already in flight and share its result
+    
+    Returns:
+        Response text string of the owning request
+    
+    Raises:
+        ChatCompletionError: If the owning request failed or was cancelled
+    """
+    logger.debug("Joining identical in-flight request")
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        # The owner gave up (deadline or closed stream); report that as a
+        # failed request unless this caller is itself being cancelled
+        if future.cancelled() and not asyncio.current_task().cancelling():
+            raise ChatCompletionError("unexpected") from None
+        raise
+
+def _is_quota_error(error):
+    """Check whether an API error means the account's quota is used up"""
+    return getattr(error, "status_code", None) == 429 and "insufficient_quota" in str(error)
+
+async def _chat_completion_async(client, messages, model, max_tokens, temperature, retries):
+    """
+    Retry loop for chat_completion, run on the background event loop
+    
+    Returns:
+        Response text string
+    
+    Raises:
+        ChatCompletionError: If the request fails or retries are exhausted
+    """
+    current_retry = 0
+    delay = 0
+    while True:
+        logger.debug("Attempt %d of %d", current_retry + 1, retries + 1)
+        try:
+            await _rate_limiter.take()
+            response = await asyncio.wait_for(
+                client.chat.completions.create(
+                    model=model,  # The newest OpenAI model is "gpt-4o" which was released May 13, 2024
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                ),
+                timeout=REQUEST_TIMEOUT
+            )
+            logger.debug("Successfully got response from OpenAI API")
+            return response.choices[0].message.content
+        
+        except AuthenticationError as e:
+            # Authentication error - no point in retrying
+            logger.error("Authentication error: %s. Check your API key.", e)
+            raise ChatCompletionError("authentication") from e
+        
+        except (RateLimitError, APIError) as e:
+            if _is_quota_error(e):
+                logger.error("OpenAI API quota exceeded.")
+                raise ChatCompletionError("quota") from e
+            
+            logger.warning("API error: %s", e)
+            if current_retry >= retries:
+                logger.error("Failed to get response after %d attempts.", current_retry + 1)
+                raise ChatCompletionError("api") from e
+            delay = get_retry_delay(delay, e)
+        
+        except Exception as e:
+            # Other unexpected error (including asyncio.TimeoutError)
+            logger.warning("Unexpected error: %r", e)
+            if current_retry >= retries:
+                logger.error("Failed to get response after %d attempts.", current_retry + 1)
+                raise ChatCompletionError("unexpected") from e
+            delay = get_retry_delay(delay, e)
+        
+        logger.debug("Retrying in %.1f seconds...", delay)
+        await asyncio.sleep(delay)
+        current_retry += 1
+
+async def chat_completion_async(messages, model="gpt-4o", max_tokens=500, temperature=0.7,
+                                retries=MAX_RETRIES, system_message=None):
+    """
+    Async version of chat_completion, for use with asyncio.gather
+    
+    Must be awaited on the loop returned by get_event_loop(), which owns
+    the shared client.
     
     Args:
         messages: List of message objects
@@ -42,293 +401,287 @@ def chat_completion(messages, model="gpt-4o", max_tokens=500, temperature=0.7,
         system_message: Optional system message to prepend
     
     Returns:
-        Response text string or None if failed
+        Response text string or None if the API key is missing
+    
+    Raises:
+        ChatCompletionError: If the request fails or retries are exhausted
     """
-    print(f"DEBUG: chat_completion called with model={model}, max_tokens={max_tokens}")
-    client = get_openai_client()
+    logger.debug("chat_completion called with model=%s, max_tokens=%s", model, max_tokens)
+    client = get_async_openai_client()
     if not client:
-        print("DEBUG: OpenAI API key not found in chat_completion. Cannot make API request.")
+        logger.debug("OpenAI API key not found in chat_completion. Cannot make API request.")
         return None
-    else:
-        print("DEBUG: OpenAI client initialized successfully")
     
     # Add system message if provided
     if system_message and not any(msg.get("role") == "system" for msg in messages):
-        print("DEBUG: Adding system message to messages array")
         messages = [{"role": "system", "content": system_message}] + messages
     
-    # Direct API approach as a fallback option if we encounter issues with the client
-    url = "https://api.openai.com/v1/chat/completions"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}"
-    }
+    # Identical requests already in flight share one API call. All callers run
+    # on the same event loop, so the check-and-insert below cannot race.
+    key = get_request_key(model, messages, max_tokens, temperature)
+    future = _inflight_requests.get(key)
+    if future is not None:
+        return await _join_inflight_request(future)
     
-    current_retry = 0
-    while current_retry <= retries:
-        print(f"DEBUG: Attempt {current_retry + 1} of {retries + 1}")
-        try:
-            # Make the API request using the client
-            print("DEBUG: About to call client.chat.completions.create")
-            # Import for timeout handling
-            import threading
-            import queue
-            
-            response_queue = queue.Queue()
-            
-            def api_call():
-                try:
-                    resp = client.chat.completions.create(
-                        model=model,  # The newest OpenAI model is "gpt-4o" which was released May 13, 2024
-                        messages=messages,
-                        temperature=temperature,
-                        max_tokens=max_tokens,
-                        timeout=15  # 15 second timeout
-                    )
-                    response_queue.put(resp)
-                except Exception as e:
-                    response_queue.put(e)
-            
-            # Create and start thread
-            thread = threading.Thread(target=api_call)
-            thread.daemon = True
-            thread.start()
-            
-            # Wait for the thread to complete or timeout
-            thread.join(30)  # 30 second total timeout
-            
-            if thread.is_alive():
-                print("DEBUG: API call timeout - taking too long")
-                raise Exception("OpenAI API call timed out after 30 seconds")
-            
-            # Get response from queue
-            response_or_error = response_queue.get(block=False)
-            
-            # Check if we got an error
-            if isinstance(response_or_error, Exception):
-                raise response_or_error
-                
-            # Otherwise, we got a response
-            response = response_or_error
-            print("DEBUG: Successfully got response from OpenAI API")
-            return response.choices[0].message.content
-            
-        except RateLimitError as e:
-            delay = BASE_DELAY * (2 ** current_retry)
-            print(f"DEBUG: Rate limit exceeded. Retrying in {delay} seconds... Error: {str(e)}")
-            time.sleep(delay)
-        
-        except APIConnectionError as e:
-            # Connection error - try direct API approach
-            print(f"DEBUG: Connection error with client: {str(e)}. Trying direct API approach...")
-            
-            try:
-                import requests
-                payload = {
-                    "model": model,
-                    "messages": messages,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens
-                }
-                
-                response = requests.post(url, headers=headers, json=payload, timeout=10)
-                
-                if response.status_code == 200:
-                    response_json = response.json()
-                    return response_json["choices"][0]["message"]["content"]
-                elif response.status_code == 429 and "insufficient_quota" in response.text:
-                    print("OpenAI API quota exceeded. The API key has insufficient credits.")
-                    return "I'm sorry, but the OpenAI API quota has been exceeded. Please check your API key's billing status or try again later."
-                else:
-                    print(f"Direct API request failed with status code {response.status_code}: {response.text}")
-            except Exception as direct_api_error:
-                print(f"Direct API approach failed: {str(direct_api_error)}")
-            
-            # Continue with retry logic
-            if current_retry < retries:
-                delay = BASE_DELAY * (2 ** current_retry)
-                print(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
-        
-        except AuthenticationError as e:
-            # Authentication error - no point in retrying
-            print(f"Authentication error: {str(e)}. Check your API key.")
-            return "I'm sorry, but there was an authentication error with the OpenAI API. Please check that your API key is valid."
-            
-        except APIError as e:
-            if getattr(e, 'status_code', None) == 429:
-                # Try to check if it's a quota issue
-                error_message = str(e)
-                if "insufficient_quota" in error_message:
-                    print("OpenAI API quota exceeded.")
-                    return "I'm sorry, but the OpenAI API quota has been exceeded. Please check your API key's billing status or try again later."
-                
-                # Regular rate limit - retry with backoff
-                delay = BASE_DELAY * (2 ** current_retry)
-                print(f"Rate limit exceeded. Retrying in {delay} seconds...")
-                time.sleep(delay)
-            else:
-                # Other API error
-                print(f"API error: {str(e)}.")
-                if current_retry < retries:
-                    delay = BASE_DELAY * (2 ** current_retry)
-                    print(f"Retrying in {delay} seconds...")
-                    time.sleep(delay)
-                else:
-                    return "I'm sorry, but there was an error communicating with the OpenAI API. Please try again later."
-                    
-        except Exception as e:
-            # Other unexpected error
-            print(f"Unexpected error: {str(e)}.")
-            if current_retry < retries:
-                delay = BASE_DELAY * (2 ** current_retry)
-                print(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
-            else:
-                return "I'm sorry, but there was an unexpected error when trying to generate a response. Please try again later."
-                
-        current_retry += 1
-    
-    # If we've exhausted all retries
-    print("Failed to get response after maximum retries.")
-    return "I'm sorry, but I couldn't connect to the OpenAI API after multiple attempts. Please try again later."
+    future = asyncio.get_running_loop().create_future()
+    _inflight_requests[key] = future
+    try:
+        result = await _chat_completion_async(client, messages, model, max_tokens, temperature, retries)
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark the exception as retrieved in case no other caller joined
+        future.exception()
+        raise
+    finally:
+        _inflight_requests.pop(key, None)
 
-def generate_climate_response(query, chat_history=None):
+def chat_completion(messages, model="gpt-4o", max_tokens=500, temperature=0.7, 
+                   retries=MAX_RETRIES, system_message=None, deadline=RESPONSE_DEADLINE):
     """
-    Generate a climate-specific response using OpenAI
+    Get a completion from OpenAI Chat API with retry logic
     
     Args:
-        query: User's query text
-        chat_history: Optional chat history for context
+        messages: List of message objects
+        model: Model to use (default: gpt-4o)
+        max_tokens: Maximum tokens to generate
+        temperature: Temperature for generation
+        retries: Number of retries (default: MAX_RETRIES)
+        system_message: Optional system message to prepend
+        deadline: Seconds allowed for the whole call, retries included
     
     Returns:
-        Response text or fallback response if API fails
-    """
-    print(f"DEBUG: generate_climate_response called with query: {query}")
-    print(f"DEBUG: chat_history length: {len(chat_history) if chat_history else 0}")
+        Response text string or None if the API key is missing
     
-    # First check if we have an API key
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        print("DEBUG: OpenAI API key not found")
-        return (
-            "I notice that the OpenAI API key is not set up. To enable my AI-powered responses, "
-            "please add your OpenAI API key in the settings. In the meantime, I'll do my best to help "
-            "with climate data visualization and analysis using my built-in knowledge."
-        )
-    else:
-        print(f"DEBUG: API key found (starts with: {api_key[:4]}...)")
-    
-    # System message for CeCe's identity
-    system_message = """
-    You are CeCe (Climate Copilot), an AI assistant specializing in climate and weather data analysis.
-    You help users with climate data visualization, scientific calculations, and understanding weather patterns.
-    Your responses should be friendly, helpful, and focused on climate science.
-    Include specific details about what data sources you would check and what visualizations you could generate.
-    
-    Format your responses with these elements:
-    1. The main response addressing the user's question directly
-    2. REQUIRED: One single follow-up suggestion at the end in a separate paragraph that starts with one of these phrases:
-       - "Would you like me to..."
-       - "Would you like to see..."
-       - "Should I..."
-       - "Do you want me to..."
-       Always include exactly one of these phrases followed by a concrete action I can take.
-    3. End with a "Sources:" section that lists 2-3 relevant sources in a formatted way, such as:
-       Sources:
-       • [National Weather Service](https://weather.gov)
-       • [NASA POWER API](https://power.larc.nasa.gov)
-       • [NOAA Climate Data](https://www.ncdc.noaa.gov)
-    """
-    
-    # Create messages array
-    messages = []
-    
-    # Add chat history for context if provided
-    if chat_history:
-        # Add up to 4 previous exchanges for context
-        for msg in chat_history[-8:]:  # Limit to prevent token overload
-            messages.append(msg)
+    Raises:
+        ChatCompletionError: If the request fails or retries are exhausted
+        TimeoutError: If no response arrives before the deadline
+    """
+    future = asyncio.run_coroutine_threadsafe(
+        asyncio.wait_for(
+            chat_completion_async(messages, model=model, max_tokens=max_tokens,
+                                  temperature=temperature, retries=retries,
+                                  system_message=system_message),
+            timeout=deadline
+        ),
+        get_event_loop()
+    )
+    return future.result()
+
+async def _chat_completion_stream_async(client, messages, model, max_tokens, temperature, retries):
+    """
+    Streaming request for chat_completion_stream_async, with a retry fallback
     
-    # Add user query if not already included in history
-    if not chat_history or chat_history[-1]["role"] != "user":
-        messages.append({"role": "user", "content": query})
+    The stream counts as the first attempt. If it fails with a transient error
+    before any text arrives, the remaining retries go through the regular retry
+    loop and its result is yielded in one piece.
     
-    print(f"DEBUG: Final messages array has {len(messages)} messages")
+    Yields:
+        Response text chunks
     
+    Raises:
+        ChatCompletionError: If the request fails before any text arrives
+    """
+    received_text = False
     try:
-        print("DEBUG: About to call chat_completion")
-        # Get response from OpenAI
-        response = chat_completion(
-            messages=messages,
-            system_message=system_message,
-            max_tokens=500,
-            temperature=0.7
+        await _rate_limiter.take()
+        stream = await asyncio.wait_for(
+            client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            ),
+            timeout=REQUEST_TIMEOUT
         )
+        # Closes the HTTP response however iteration ends
+        async with stream:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    received_text = True
+                    yield chunk.choices[0].delta.content
+    except Exception as e:
+        if received_text:
+            raise
+        if isinstance(e, AuthenticationError):
+            logger.error("Authentication error: %s. Check your API key.", e)
+            raise ChatCompletionError("authentication") from e
+        if _is_quota_error(e):
+            logger.error("OpenAI API quota exceeded.")
+            raise ChatCompletionError("quota") from e
+        
+        # Only rate limiting, server errors and network trouble are worth retrying
+        transient = isinstance(e, (RateLimitError, InternalServerError, APIConnectionError, asyncio.TimeoutError))
+        if not transient or retries < 1:
+            logger.warning("Streaming failed before first token: %r", e)
+            raise ChatCompletionError("api" if isinstance(e, APIError) else "unexpected") from e
         
-        # Return the response if successful
-        if response:
-            print("DEBUG: Got successful response from chat_completion")
-            return response
-        else:
-            print("DEBUG: chat_completion returned None")
+        delay = get_retry_delay(0, e)
+        logger.debug("Streaming failed before first token: %r. Retrying without streaming in %.1f seconds...",
+                     e, delay)
+        await asyncio.sleep(delay)
+        text = await _chat_completion_async(client, messages, model, max_tokens, temperature, retries - 1)
+        if text:
+            yield text
+
+async def chat_completion_stream_async(messages, model="gpt-4o", max_tokens=500, temperature=0.7,
+                                       retries=MAX_RETRIES):
+    """
+    Stream a completion from OpenAI Chat API as an async generator
+    
+    If the stream fails with a transient error before any text arrives, the
+    remaining retries go through the regular retry loop and its result is
+    yielded in one piece.
+    A caller that joins an identical request already in flight (streamed or
+    not) also receives the whole text in one piece once it completes.
+    Must be iterated on the loop returned by get_event_loop().
+    
+    Args:
+        messages: List of message objects
+        model: Model to use (default: gpt-4o)
+        max_tokens: Maximum tokens to generate
+        temperature: Temperature for generation
+        retries: Number of retries for the non-streamed fallback
+    
+    Yields:
+        Response text chunks
+    
+    Raises:
+        ChatCompletionError: If the request fails before any text arrives
+    """
+    client = get_async_openai_client()
+    if not client:
+        logger.debug("OpenAI API key not found in chat_completion_stream. Cannot make API request.")
+        return
+    
+    # Shares in-flight requests with chat_completion_async; see the note there
+    key = get_request_key(model, messages, max_tokens, temperature)
+    future = _inflight_requests.get(key)
+    if future is not None:
+        text = await _join_inflight_request(future)
+        if text:
+            yield text
+        return
+    
+    future = asyncio.get_running_loop().create_future()
+    _inflight_requests[key] = future
+    chunks = []
+    try:
+        async for chunk in _chat_completion_stream_async(client, messages, model, max_tokens,
+                                                         temperature, retries):
+            chunks.append(chunk)
+            yield chunk
+        future.set_result("".join(chunks))
     except Exception as e:
-        print(f"DEBUG: Error in generate_climate_response: {str(e)}")
-        # Continue to fallback logic below
+        future.set_exception(e)
+        # Mark the exception as retrieved in case no other caller joined
+        future.exception()
+        raise
+    finally:
+        _inflight_requests.pop(key, None)
+        # Closed early or cancelled: release any callers waiting on this request
+        if not future.done():
+            future.cancel()
+
+def chat_completion_stream(messages, model="gpt-4o", max_tokens=500, temperature=0.7,
+                           retries=MAX_RETRIES, deadline=RESPONSE_DEADLINE):
+    """
+    Stream a completion from OpenAI Chat API
+    
+    Sync generator over chat_completion_stream_async, suitable for
+    st.write_stream.
+    
+    Args:
+        messages: List of message objects
+        model: Model to use (default: gpt-4o)
+        max_tokens: Maximum tokens to generate
+        temperature: Temperature for generation
+        retries: Number of retries for the non-streamed fallback
+        deadline: Seconds allowed for the whole stream, retries included
+    
+    Yields:
+        Response text chunks
+    
+    Raises:
+        ChatCompletionError: If the request fails before any text arrives
+        TimeoutError: If the stream does not finish before the deadline
+    """
+    loop = get_event_loop()
+    stream = chat_completion_stream_async(messages, model=model, max_tokens=max_tokens,
+                                          temperature=temperature, retries=retries)
+    expires = time.monotonic() + deadline
+    try:
+        while True:
+            remaining = expires - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError
+            try:
+                chunk = asyncio.run_coroutine_threadsafe(
+                    asyncio.wait_for(stream.__anext__(), timeout=remaining), loop
+                ).result()
+            except StopAsyncIteration:
+                break
+            yield chunk
+    finally:
+        asyncio.run_coroutine_threadsafe(stream.aclose(), loop).result()
+
+# Predefined responses used when the API is unavailable
+FALLBACK_RESPONSES = {
+    "temperature": """Temperature is a key climate variable. I can help you analyze temperature trends, calculate anomalies, and visualize temperature data. You can use the preset buttons above to explore temperature-related features.
     
-    # Fallback logic - use predefined responses
-    print("Using fallback response system")
-    climate_responses = {
-        "temperature": """Temperature is a key climate variable. I can help you analyze temperature trends, calculate anomalies, and visualize temperature data. You can use the preset buttons above to explore temperature-related features.
-        
 Would you like me to create a temperature trend visualization for your location?
 
 Sources:
 • [NASA POWER API](https://power.larc.nasa.gov)
 • [NOAA Climate Data](https://www.ncdc.noaa.gov)""",
 
-        "precipitation": """Precipitation includes rain, snow, and other forms of water falling from the sky. I can help you analyze precipitation patterns and create visualization maps.
-        
+    "precipitation": """Precipitation includes rain, snow, and other forms of water falling from the sky. I can help you analyze precipitation patterns and create visualization maps.
+    
 Would you like me to generate a precipitation map for your area?
 
 Sources:
 • [NASA POWER API](https://power.larc.nasa.gov)
 • [NOAA Precipitation Data](https://www.weather.gov/precipitation)""",
 
-        "climate change": """Climate change refers to significant changes in global temperature, precipitation, wind patterns, and other measures of climate that occur over several decades or longer. I can help you analyze climate data to understand these changes.
-        
+    "climate change": """Climate change refers to significant changes in global temperature, precipitation, wind patterns, and other measures of climate that occur over several decades or longer. I can help you analyze climate data to understand these changes.
+    
 Would you like me to show you long-term temperature trend analysis for your region?
 
 Sources:
 • [NASA Climate Change Portal](https://climate.nasa.gov)
 • [IPCC Reports](https://www.ipcc.ch/reports)""",
 
-        "weather": """Weather refers to day-to-day conditions, while climate refers to the average weather patterns in an area over a longer period. I can help you analyze both weather data and climate trends.
-        
+    "weather": """Weather refers to day-to-day conditions, while climate refers to the average weather patterns in an area over a longer period. I can help you analyze both weather data and climate trends.
+    
 Would you like me to generate a climate report for your location?
 
 Sources:
 • [National Weather Service](https://weather.gov)
 • [Weather Underground](https://www.wunderground.com)""",
 
-        "forecast": """While I don't provide real-time weather forecasts, I can help you analyze historical climate data and identify patterns that might inform future conditions.
-        
+    "forecast": """While I don't provide real-time weather forecasts, I can help you analyze historical climate data and identify patterns that might inform future conditions.
+    
 Would you like me to analyze historical weather patterns for your area instead?
 
 Sources:
 • [National Weather Service](https://weather.gov)
 • [NOAA Climate Prediction Center](https://www.cpc.ncep.noaa.gov)""",
 
-        "hello": """Hello! I'm CeCe, your Climate Copilot. I'm here to help you analyze and visualize climate data. 
-        
+    "hello": """Hello! I'm CeCe, your Climate Copilot. I'm here to help you analyze and visualize climate data. 
+    
 Would you like me to show you how to generate a precipitation map or analyze temperature trends?
 
 Sources:
 • [NASA POWER API](https://power.larc.nasa.gov)
 • [NOAA Climate Data](https://www.ncdc.noaa.gov)""",
 
-        "help": """I can help you with climate data analysis, visualization, and scientific calculations. Try one of the preset buttons above to get started, or ask me a specific question about climate data.
-        
+    "help": """I can help you with climate data analysis, visualization, and scientific calculations. Try one of the preset buttons above to get started, or ask me a specific question about climate data.
+    
 Would you like me to suggest some interesting climate analyses we could do together?
 
 Sources:
@@ -336,27 +689,233 @@ Sources:
 • [NOAA Climate Data](https://www.ncdc.noaa.gov)
 • [Climate.gov](https://www.climate.gov)""",
 
-        "rain": """I can help you analyze precipitation patterns, but I don't have access to real-time weather forecasts. For the most accurate rain forecasts, I recommend checking a dedicated weather service. 
-        
+    "rain": """I can help you analyze precipitation patterns, but I don't have access to real-time weather forecasts. For the most accurate rain forecasts, I recommend checking a dedicated weather service. 
+    
 Would you like me to show you historical precipitation data for your area instead?
 
 Sources:
 • [National Weather Service](https://weather.gov)
 • [NOAA Precipitation Data](https://www.weather.gov/precipitation)"""
-    }
-    
-    # Check if the query contains any of our predefined topics
-    query_lower = query.lower()
-    for topic, response in climate_responses.items():
-        if topic in query_lower:
-            return response
-    
-    # Default fallback response
-    return """I'm currently using fallback mode due to API limitations. I can still help you analyze climate data through the preset buttons above, or with questions about temperature trends, precipitation patterns, or climate change impacts.
+}
+
+# Single compiled scan over all fallback topics, built once at import. The
+# lookahead reports every position where a topic starts, so overlapping topics
+# are all found; when several match, the one listed first in FALLBACK_RESPONSES wins.
+_FALLBACK_TOPIC_RE = re.compile("(?=(" + "|".join(re.escape(topic) for topic in FALLBACK_RESPONSES) + "))")
+_FALLBACK_TOPIC_PRIORITY = {topic: i for i, topic in enumerate(FALLBACK_RESPONSES)}
+
+# Response shown when no OpenAI API key is configured
+MISSING_API_KEY_RESPONSE = (
+    "I notice that the OpenAI API key is not set up. To enable my AI-powered responses, "
+    "please add your OpenAI API key in the settings. In the meantime, I'll do my best to help "
+    "with climate data visualization and analysis using my built-in knowledge."
+)
+
+# Default fallback response when no topic matches
+DEFAULT_FALLBACK_RESPONSE = """I'm currently using fallback mode due to API limitations. I can still help you analyze climate data through the preset buttons above, or with questions about temperature trends, precipitation patterns, or climate change impacts.
     
 Would you like me to show you one of our specialized climate visualizations instead?
 
 Sources:
 • [NASA POWER API](https://power.larc.nasa.gov)
 • [NOAA Climate Data](https://www.ncdc.noaa.gov)
-• [Climate.gov](https://www.climate.gov)"""
\ No newline at end of file
+• [Climate.gov](https://www.climate.gov)"""
+
+# System message for CeCe's identity. Kept byte-identical across calls so the
+# system prompt is always a shared prefix for OpenAI's prompt caching.
+SYSTEM_MESSAGE = """You are CeCe (Climate Copilot), an AI assistant specializing in climate and weather data analysis.
+You help users with climate data visualization, scientific calculations, and understanding weather patterns.
+Your responses should be friendly, helpful, and focused on climate science.
+Include specific details about what data sources you would check and what visualizations you could generate.
+
+Format your responses with these elements:
+1. The main response addressing the user's question directly
+2. REQUIRED: One single follow-up suggestion at the end in a separate paragraph that starts with one of these phrases:
+   - "Would you like me to..."
+   - "Would you like to see..."
+   - "Should I..."
+   - "Do you want me to..."
+   Always include exactly one of these phrases followed by a concrete action I can take.
+3. End with a "Sources:" section that lists 2-3 relevant sources in a formatted way, such as:
+   Sources:
+   • [National Weather Service](https://weather.gov)
+   • [NASA POWER API](https://power.larc.nasa.gov)
+   • [NOAA Climate Data](https://www.ncdc.noaa.gov)"""
+
+# Maximum number of history messages sent for context, and the step by which
+# the start of that window advances
+HISTORY_WINDOW = 8
+HISTORY_STEP = 4
+
+def build_messages(query, chat_history=None):
+    """
+    Build the messages array for a climate response
+    
+    The system message always comes first and the new user turn last. Old
+    history is dropped HISTORY_STEP messages at a time rather than one per
+    turn, so consecutive requests keep sharing the same leading messages.
+    
+    Args:
+        query: User's query text
+        chat_history: Optional chat history for context (not modified)
+    
+    Returns:
+        New list of message objects
+    """
+    history = chat_history or []
+    
+    # Advance the window start in whole steps, keeping at most HISTORY_WINDOW messages
+    overflow = max(0, len(history) - HISTORY_WINDOW)
+    start = -(-overflow // HISTORY_STEP) * HISTORY_STEP
+    
+    messages = [{"role": "system", "content": SYSTEM_MESSAGE}, *history[start:]]
+    
+    # Add user query if not already included in history
+    if not history or history[-1]["role"] != "user":
+        messages.append({"role": "user", "content": query})
+    
+    return messages
+
+def _prepare_climate_request(query, chat_history):
+    """
+    Shared first step of generate_climate_response and its streaming variant
+    
+    Args:
+        query: User's query text
+        chat_history: Optional chat history for context
+    
+    Returns:
+        Tuple of (messages, use_semantic_cache, ready_response). When
+        ready_response is set (missing API key or cache hit) no API call is needed.
+    """
+    # First check if we have an API key
+    if not os.getenv("OPENAI_API_KEY"):
+        logger.debug("OpenAI API key not found")
+        return None, False, MISSING_API_KEY_RESPONSE
+    
+    # Create messages array with the stable system prefix first
+    messages = build_messages(query, chat_history)
+    logger.debug("Final messages array has %d messages", len(messages))
+    
+    # Only standalone queries are cached, since earlier turns change the answer
+    use_semantic_cache = len(messages) == 2
+    if use_semantic_cache:
+        cached_response = semantic_cache_lookup(query)
+        if cached_response:
+            logger.debug("Semantic cache hit")
+            return messages, use_semantic_cache, cached_response
+    
+    return messages, use_semantic_cache, None
+
+def _complete_climate_response(query, response, use_semantic_cache, error=None):
+    """
+    Shared last step of generate_climate_response and its streaming variant
+    
+    Caches a successful response, or picks the text to show after a failure.
+    
+    Args:
+        query: User's query text
+        response: Response text from the API (empty or None if none arrived)
+        use_semantic_cache: Whether the response may be cached
+        error: Exception raised by the API call, if any
+    
+    Returns:
+        Response text to show the user
+    """
+    if error is None and response:
+        logger.debug("Got successful response from OpenAI API")
+        if use_semantic_cache:
+            semantic_cache_store(query, response)
+        return response
+    
+    if isinstance(error, ChatCompletionError):
+        return API_ERROR_RESPONSES[error.reason]
+    
+    # Fallback logic - use predefined responses
+    if isinstance(error, TimeoutError):
+        logger.warning("Response timed out after %d seconds", RESPONSE_DEADLINE)
+        return "I apologize for the delay. " + get_fallback_response(query)
+    if error is not None:
+        logger.warning("Error generating climate response: %s", error)
+    logger.info("Using fallback response system")
+    return get_fallback_response(query)
+
+def generate_climate_response(query, chat_history=None):
+    """
+    Generate a climate-specific response using OpenAI
+    
+    Args:
+        query: User's query text
+        chat_history: Optional chat history for context
+    
+    Returns:
+        Response text or fallback response if API fails
+    """
+    logger.debug("generate_climate_response called with query: %s", query)
+    
+    messages, use_semantic_cache, ready_response = _prepare_climate_request(query, chat_history)
+    if ready_response is not None:
+        return ready_response
+    
+    try:
+        response = chat_completion(messages=messages, max_tokens=500, temperature=0.7)
+    except Exception as e:
+        return _complete_climate_response(query, None, use_semantic_cache, e)
+    
+    return _complete_climate_response(query, response, use_semantic_cache)
+
+def generate_climate_response_stream(query, chat_history=None):
+    """
+    Generate a climate-specific response using OpenAI, streamed as it arrives
+    
+    Same behavior as generate_climate_response, but yields text chunks so the
+    caller can render them with st.write_stream.
+    
+    Args:
+        query: User's query text
+        chat_history: Optional chat history for context
+    
+    Yields:
+        Response text chunks
+    """
+    logger.debug("generate_climate_response_stream called with query: %s", query)
+    
+    messages, use_semantic_cache, ready_response = _prepare_climate_request(query, chat_history)
+    if ready_response is not None:
+        yield ready_response
+        return
+    
+    chunks = []
+    try:
+        for chunk in chat_completion_stream(messages, max_tokens=500, temperature=0.7):
+            chunks.append(chunk)
+            yield chunk
+    except Exception as e:
+        if chunks:
+            # Keep the partial answer rather than switching to a canned one mid-reply
+            logger.warning("Error in generate_climate_response_stream: %s", e)
+            return
+        yield _complete_climate_response(query, None, use_semantic_cache, e)
+        return
+    
+    response = _complete_climate_response(query, "".join(chunks), use_semantic_cache)
+    if not chunks:
+        yield response
+
+def get_fallback_response(query):
+    """
+    Get a predefined response for a query when the API is unavailable
+    
+    Args:
+        query: User's query text
+    
+    Returns:
+        Response text for the highest-priority topic mentioned in the query
+        (earliest in FALLBACK_RESPONSES), or a default
+    """
+    # Check if the query mentions any of our predefined topics
+    topics = {match.group(1) for match in _FALLBACK_TOPIC_RE.finditer(query.lower())}
+    if topics:
+        return FALLBACK_RESPONSES[min(topics, key=_FALLBACK_TOPIC_PRIORITY.get)]
+    
+    return DEFAULT_FALLBACK_RESPONSE
\ No newline at end of file
@@ -1,16 +1,21 @@
 import os
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from langchain.llms import HuggingFaceHub
 from langchain.chat_models import ChatOpenAI
 from langchain.chains import ConversationalRetrievalChain
 from langchain.memory import ConversationBufferMemory
-from langchain.embeddings import HuggingFaceEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.vectorstores import Chroma
+from langchain_core.vectorstores import InMemoryVectorStore
 from langchain.document_loaders import DataFrameLoader
 import pandas as pd
 from dotenv import load_dotenv
 import vector_store
 import streamlit as st
+from openai_helper import get_fallback_response
 
 # Load environment variables
 load_dotenv()
@@ -55,12 +60,9 @@ def get_llm(provider="OpenAI"):
         st.error(f"Error initializing language model: {str(e)}")
         return None
 
-# Initialize embeddings model
+# Initialize embeddings model (shared with vector_store, loaded once per process)
 def get_embeddings():
-    return HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2",
-        model_kwargs={"device": "cpu"}
-    )
+    return vector_store.get_embedding_model()
 
 # Process dataset for RAG
 def process_dataset_for_rag(df):
@@ -75,15 +77,19 @@ def process_dataset_for_rag(df):
         f"Data types: {', '.join([f'{col}: {dtype}' for col, dtype in zip(df.columns, df.dtypes.astype(str))])}"
     ]
     
-    # Add some sample data
-    sample_data = []
-    for i, row in df.head(5).iterrows():
-        sample_data.append(f"Row {i}: {', '.join([f'{col}: {val}' for col, val in row.items()])}")
+    # Add some sample data (header line plus the first rows, formatted by pandas)
+    sample_data = df.head(5).to_csv(sep=',', index=True).splitlines()
     
-    # Add statistical summary
+    # Add statistical summary, computed for all numeric columns in one aggregation
+    # (agg raises on a frame without columns, so text-only datasets get no stats)
     stats = []
-    for col in df.select_dtypes(include=['number']).columns:
-        stats.append(f"Column {col} - min: {df[col].min()}, max: {df[col].max()}, mean: {df[col].mean()}, median: {df[col].median()}")
+    numeric = df.select_dtypes(include=['number'])
+    if not numeric.empty:
+        desc = numeric.agg(['min', 'max', 'mean', 'median']).T
+        stats = [
+            f"Column {col} - min: {row['min']}, max: {row['max']}, mean: {row['mean']}, median: {row['median']}"
+            for col, row in desc.iterrows()
+        ]
     
     # Combine all text
     text = "\n".join(summary + ["Sample data:"] + sample_data + ["Statistical summary:"] + stats)
@@ -94,23 +100,57 @@ def process_dataset_for_rag(df):
     
     return [doc]
 
+# Number of uploaded-dataset vector stores kept in memory
+EPHEMERAL_VS_CACHE_SIZE = 4
+_ephemeral_vector_stores = OrderedDict()
+# Guards the cache across Streamlit session threads. Builds run under it too,
+# so concurrent uploads of the same dataset embed it only once.
+_ephemeral_vector_stores_lock = threading.Lock()
+
+def get_dataframe_hash(df):
+    """Content hash of a DataFrame, including column names"""
+    digest = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    digest.update(",".join(map(str, df.columns)).encode())
+    return digest.hexdigest()
+
+# Load the persistent vector store once per process
+@lru_cache(maxsize=1)
+def _get_persistent_vs():
+    embeddings = get_embeddings()
+    return Chroma(persist_directory="./chroma_db", embedding_function=embeddings)
+
+# Build a vector store for an uploaded dataset
+def _build_dataset_vs(df):
+    documents = process_dataset_for_rag(df)
+    if not documents:
+        return None
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+    splits = text_splitter.split_documents(documents)
+    
+    # The dataset summary splits into a handful of chunks, so an exact numpy
+    # similarity scan beats building any index
+    return InMemoryVectorStore.from_documents(splits, get_embeddings())
+
 # Create or retrieve vector store
 def get_vector_store(df=None):
-    # If df is provided, create a new vector store
+    # If df is provided, reuse or create the vector store for its contents
     if df is not None:
-        documents = process_dataset_for_rag(df)
-        if documents:
-            embeddings = get_embeddings()
-            text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-            splits = text_splitter.split_documents(documents)
-            vector_store = Chroma.from_documents(documents=splits, embedding=embeddings)
-            return vector_store
+        df_hash = get_dataframe_hash(df)
+        with _ephemeral_vector_stores_lock:
+            if df_hash in _ephemeral_vector_stores:
+                _ephemeral_vector_stores.move_to_end(df_hash)
+                return _ephemeral_vector_stores[df_hash]
+            
+            vector_store = _build_dataset_vs(df)
+            if vector_store is not None:
+                _ephemeral_vector_stores[df_hash] = vector_store
+                if len(_ephemeral_vector_stores) > EPHEMERAL_VS_CACHE_SIZE:
+                    _ephemeral_vector_stores.popitem(last=False)
+                return vector_store
     
     # Otherwise, try to load from persistent storage
     try:
-        embeddings = get_embeddings()
-        vector_store = Chroma(persist_directory="./chroma_db", embedding_function=embeddings)
-        return vector_store
+        return _get_persistent_vs()
     except:
         # If no persistent store exists and no df provided, return None
         return None
@@ -204,25 +244,3 @@ def process_query(query, df=None):
     except Exception as e:
         # Fallback response in case of errors
         return f"I apologize, but I encountered an error processing your request: {str(e)}. Please try again or rephrase your question."
-
-# Get a predefined response for common climate questions
-def get_fallback_response(query):
-    # A dictionary of predefined responses for common queries
-    climate_responses = {
-        "temperature": "Temperature is a key climate variable. I can help you analyze temperature trends, calculate anomalies, and visualize temperature data. You can use the preset buttons above to explore temperature-related features.",
-        "precipitation": "Precipitation includes rain, snow, and other forms of water falling from the sky. I can help you analyze precipitation patterns and create visualization maps. Try the 'Generate a precipitation map' button above!",
-        "climate change": "Climate change refers to significant changes in global temperature, precipitation, wind patterns, and other measures of climate that occur over several decades or longer. I can help you analyze climate data to understand these changes.",
-        "weather": "Weather refers to day-to-day conditions, while climate refers to the average weather patterns in an area over a longer period. I can help you analyze both weather data and climate trends.",
-        "forecast": "While I don't provide real-time weather forecasts, I can help you analyze historical climate data and identify patterns that might inform future conditions.",
-        "hello": "Hello! I'm CeCe, your Climate Copilot. I'm here to help you analyze and visualize climate data. How can I assist you today?",
-        "help": "I can help you with climate data analysis, visualization, and scientific calculations. Try one of the preset buttons above to get started, or ask me a specific question about climate data."
-    }
-    
-    # Check if the query contains any of our predefined topics
-    query_lower = query.lower()
-    for topic, response in climate_responses.items():
-        if topic in query_lower:
-            return response
-    
-    # Default response if no specific topic is matched
-    return "I'm CeCe, your Climate Copilot. I can help you analyze climate data, create visualizations, and perform scientific calculations. Try one of the preset buttons above, or ask me a specific question about climate or weather data!"
@@ -6,16 +6,122 @@ using a simplified approach that avoids complex image processing.
 """
 
 import streamlit as st
-import folium
-from folium.plugins import HeatMap, MarkerCluster
-from streamlit_folium import folium_static
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import random
 
-# Import our simplified artistic map module
-import simple_artistic_maps
+# Default map center (Paris), used when a city cannot be geocoded
+_DEFAULT_LATITUDE = 48.8566
+_DEFAULT_LONGITUDE = 2.3522
+
+# Color theme names offered in the demo, mapped to their artistic palette
+_STYLE_MAPPING = {
+    "ethereal": "climate_ethereal",
+    "dramatic": "temperature_dramatic",
+    "moody": "precipitation_moody",
+    "surreal": "topography_surreal",
+    "vibrant": "vegetation_vibrant",
+    "neon": "urban_neon",
+    "artistic": "artistic_terrain"
+}
+
+# Static explanation of the basemaps, overlays and data sources
+_ABOUT_MAPS_HTML = """
+<div style="background-color: rgba(30, 30, 30, 0.6); padding: 15px; border-radius: 8px; margin-bottom: 10px;">
+    <h4 style="color: #1E90FF; margin-top: 0;">Available Basemaps</h4>
+    <ul style="color: white;">
+        <li><strong>Dark Minimal:</strong> Clean, minimalist dark-themed basemap good for data visualization</li>
+        <li><strong>Light Minimal:</strong> Bright, clean basemap with subtle features</li>
+        <li><strong>Street Map:</strong> OpenStreetMap with detailed roads and infrastructure</li>
+        <li><strong>Satellite:</strong> Esri World Imagery with high-resolution aerial photography</li>
+        <li><strong>Topographic Map:</strong> OpenTopoMap with detailed terrain and elevation data</li>
+        <li><strong>Terrain Relief:</strong> Stamen terrain map emphasizing natural features and landforms</li>
+    </ul>
+    
+    <h4 style="color: #1E90FF; margin-top: 15px;">Toggleable Overlays</h4>
+    <ul style="color: white;">
+        <li><strong>Topography Lines:</strong> Contour lines that show elevation changes</li>
+        <li><strong>Place Labels:</strong> City, town and street names (automatically shown on satellite view)</li>
+    </ul>
+    
+    <h4 style="color: #1E90FF; margin-top: 15px;">Data Sources</h4>
+    <ul style="color: white;">
+        <li><strong>Topographic Data:</strong> OpenTopoMap provides topographic information based on OpenStreetMap and SRTM data</li>
+        <li><strong>Satellite Imagery:</strong> Esri World Imagery provides satellite and aerial imagery</li>
+        <li><strong>Base Maps:</strong> OpenStreetMap and CartoDB provide the underlying mapping infrastructure</li>
+        <li><strong>Contour Lines:</strong> SRTM30 dataset provides global elevation contours</li>
+    </ul>
+    
+    <h4 style="color: #1E90FF; margin-top: 15px;">Map Features</h4>
+    <p style="color: white;">
+        What makes these maps unique:
+    </p>
+    <ul style="color: white;">
+        <li>Sophisticated layer control system with multiple basemap options in one interface</li>
+        <li>Specialized overlays like "Place Labels" that can be combined with any basemap</li>
+        <li>Custom CSS styling for a professional, polished user experience</li>
+        <li>High-quality data from multiple providers combined in a seamless experience</li>
+        <li>Carefully selected map sources that provide exceptional detail and clarity</li>
+    </ul>
+    
+    <div style="margin-top: 15px; padding: 10px; border-radius: 5px; background-color: rgba(30, 144, 255, 0.2); color: white;">
+        <p><strong>Tip:</strong> Use the layer control panel in the top-right corner of the map to toggle between different basemaps and overlays!</p>
+    </div>
+</div>
+"""
+
+def build_artistic_map(lat, lon, data_type, zoom, width, height, style, css_style=None):
+    """
+    Build a styled, watermarked artistic map
+    
+    Args:
+        lat: Latitude of the map center
+        lon: Longitude of the map center
+        data_type: Visualization type ("topography" or "satellite")
+        zoom: Initial zoom level
+        width: Map width in pixels
+        height: Map height in pixels
+        style: Color theme name
+        css_style: Optional CSS style theme to apply
+    
+    Returns:
+        folium.Map object
+    """
+    import folium
+    
+    # Import our simplified artistic map module
+    import simple_artistic_maps
+    
+    # Create the artistic climate map
+    m = simple_artistic_maps.create_artistic_climate_map(
+        lat=lat,
+        lon=lon,
+        data_type=data_type,
+        zoom=zoom,
+        width=width,
+        height=height,
+        style=style
+    )
+    
+    # Apply custom styling if requested
+    if css_style:
+        m = simple_artistic_maps.apply_style_to_map(m, style_name=css_style)
+    
+    # Add a watermark
+    m.get_root().html.add_child(folium.Element(
+        simple_artistic_maps.generate_map_watermark(text="Climate CoPilot")
+    ))
+    
+    return m
+
+@st.cache_data(show_spinner=False)
+def render_artistic_map_html(lat, lon, data_type, zoom, width, height, style, css_style=None):
+    """
+    Render an artistic map to standalone HTML (cached per set of inputs)
+    
+    Takes the same arguments as build_artistic_map.
+    
+    Returns:
+        HTML document string for the map
+    """
+    return build_artistic_map(lat, lon, data_type, zoom, width, height, style, css_style).get_root().render()
 
 def run_artistic_map_demo():
     """
@@ -61,29 +167,29 @@ def run_artistic_map_demo():
             # Check if we got valid coordinates
             if latitude is None or longitude is None:
                 st.error(f"Could not find coordinates for '{city}'. Please try another city name or format like 'City, Country'.")
-                # Set default coordinates for Paris to allow the demo to continue
-                latitude, longitude = 48.8566, 2.3522
-                st.warning(f"Using default coordinates for demonstration: {latitude:.4f}, {longitude:.4f}")
-            else:
-                st.success(f"Coordinates found: {latitude:.4f}, {longitude:.4f}")
         except Exception as e:
             st.error(f"Error getting coordinates: {str(e)}")
-            # Set default coordinates to allow the demo to continue
-            latitude, longitude = 48.8566, 2.3522
+            latitude = longitude = None
+        
+        if latitude is None or longitude is None:
+            # Set default coordinates for Paris to allow the demo to continue
+            latitude, longitude = _DEFAULT_LATITUDE, _DEFAULT_LONGITUDE
             st.warning(f"Using default coordinates for demonstration: {latitude:.4f}, {longitude:.4f}")
+        else:
+            st.success(f"Coordinates found: {latitude:.4f}, {longitude:.4f}")
     else:
         col1, col2 = st.columns(2)
         with col1:
-            latitude = st.number_input("Latitude:", value=48.8566, min_value=-90.0, max_value=90.0, step=0.01)
+            latitude = st.number_input("Latitude:", value=_DEFAULT_LATITUDE, min_value=-90.0, max_value=90.0, step=0.01)
         with col2:
-            longitude = st.number_input("Longitude:", value=2.3522, min_value=-180.0, max_value=180.0, step=0.01)
+            longitude = st.number_input("Longitude:", value=_DEFAULT_LONGITUDE, min_value=-180.0, max_value=180.0, step=0.01)
     
     # Map style selection
     st.markdown("<h3 style='color: #1E90FF;'>Map Style</h3>", unsafe_allow_html=True)
     
     map_style = st.selectbox(
         "Select color theme:",
-        ["ethereal", "dramatic", "moody", "surreal", "vibrant", "neon", "artistic"],
+        list(_STYLE_MAPPING),
         index=0,
         format_func=lambda x: x.capitalize()
     )
@@ -127,105 +233,46 @@ def run_artistic_map_demo():
     st.markdown("</div>", unsafe_allow_html=True)
     
     if generate_map:
+        import streamlit.components.v1 as components
+        
+        # Import our simplified artistic map module
+        import simple_artistic_maps
+        
         with st.spinner(f"Creating advanced interactive map for {location_method.lower()} {city if location_method == 'City Name' else f'({latitude:.4f}, {longitude:.4f})'}..."):
-            # Create the artistic climate map
-            m = simple_artistic_maps.create_artistic_climate_map(
-                lat=latitude,
-                lon=longitude,
-                data_type=data_type,
-                zoom=zoom_level,
-                width=width,
-                height=height,
-                style=map_style
+            # Create the artistic climate map, reusing the rendered HTML for repeated
+            # identical requests
+            map_html = render_artistic_map_html(
+                latitude,
+                longitude,
+                data_type,
+                zoom_level,
+                width,
+                height,
+                map_style,
+                css_style if custom_styling else None
             )
             
-            # Apply custom styling if requested
-            if custom_styling:
-                m = simple_artistic_maps.apply_style_to_map(m, style_name=css_style)
-            
-            # Add a watermark
-            m.get_root().html.add_child(folium.Element(
-                simple_artistic_maps.generate_map_watermark(text="Climate CoPilot")
-            ))
-            
             # Display the map
-            folium_static(m, width=width, height=height)
+            components.html(map_html, width=width, height=height)
             
             # Display color palette used
-            style_mapping = {
-                "ethereal": "climate_ethereal",
-                "dramatic": "temperature_dramatic",
-                "moody": "precipitation_moody",
-                "surreal": "topography_surreal",
-                "vibrant": "vegetation_vibrant",
-                "neon": "urban_neon",
-                "artistic": "artistic_terrain"
-            }
-            
-            palette_name = style_mapping.get(map_style, "climate_ethereal")
+            palette_name = _STYLE_MAPPING.get(map_style, "climate_ethereal")
             palette = simple_artistic_maps.ARTISTIC_PALETTES[palette_name]
             
             st.markdown(f"<h4 style='color: #1E90FF;'>Color Palette: {palette['name']}</h4>", unsafe_allow_html=True)
             st.markdown(f"<p>{palette['description']}</p>", unsafe_allow_html=True)
             
-            # Display the color swatches as colored rectangles
-            cols = st.columns(len(palette["colors"]))
-            for i, color in enumerate(palette["colors"]):
-                with cols[i]:
-                    st.markdown(
-                        f"""
-                        <div style="background-color: {color}; height: 50px; width: 100%; 
-                                  border-radius: 5px; margin: 5px 0;"></div>
-                        """, 
-                        unsafe_allow_html=True
-                    )
+            # Display the color swatches as colored rectangles in a single flex row
+            swatches = "".join(
+                f'<div style="background-color: {color}; height: 50px; flex: 1; border-radius: 5px; margin: 5px 0;"></div>'
+                for color in palette["colors"]
+            )
+            st.markdown(f'<div style="display: flex; gap: 1rem;">{swatches}</div>', unsafe_allow_html=True)
     
     # Display information about the data sources
     st.markdown("<h3 style='color: #1E90FF;'>About the Maps</h3>", unsafe_allow_html=True)
     
-    st.markdown("""
-    <div style="background-color: rgba(30, 30, 30, 0.6); padding: 15px; border-radius: 8px; margin-bottom: 10px;">
-        <h4 style="color: #1E90FF; margin-top: 0;">Available Basemaps</h4>
-        <ul style="color: white;">
-            <li><strong>Dark Minimal:</strong> Clean, minimalist dark-themed basemap good for data visualization</li>
-            <li><strong>Light Minimal:</strong> Bright, clean basemap with subtle features</li>
-            <li><strong>Street Map:</strong> OpenStreetMap with detailed roads and infrastructure</li>
-            <li><strong>Satellite:</strong> Esri World Imagery with high-resolution aerial photography</li>
-            <li><strong>Topographic Map:</strong> OpenTopoMap with detailed terrain and elevation data</li>
-            <li><strong>Terrain Relief:</strong> Stamen terrain map emphasizing natural features and landforms</li>
-        </ul>
-        
-        <h4 style="color: #1E90FF; margin-top: 15px;">Toggleable Overlays</h4>
-        <ul style="color: white;">
-            <li><strong>Topography Lines:</strong> Contour lines that show elevation changes</li>
-            <li><strong>Place Labels:</strong> City, town and street names (automatically shown on satellite view)</li>
-        </ul>
-        
-        <h4 style="color: #1E90FF; margin-top: 15px;">Data Sources</h4>
-        <ul style="color: white;">
-            <li><strong>Topographic Data:</strong> OpenTopoMap provides topographic information based on OpenStreetMap and SRTM data</li>
-            <li><strong>Satellite Imagery:</strong> Esri World Imagery provides satellite and aerial imagery</li>
-            <li><strong>Base Maps:</strong> OpenStreetMap and CartoDB provide the underlying mapping infrastructure</li>
-            <li><strong>Contour Lines:</strong> SRTM30 dataset provides global elevation contours</li>
-        </ul>
-        
-        <h4 style="color: #1E90FF; margin-top: 15px;">Map Features</h4>
-        <p style="color: white;">
-            What makes these maps unique:
-        </p>
-        <ul style="color: white;">
-            <li>Sophisticated layer control system with multiple basemap options in one interface</li>
-            <li>Specialized overlays like "Place Labels" that can be combined with any basemap</li>
-            <li>Custom CSS styling for a professional, polished user experience</li>
-            <li>High-quality data from multiple providers combined in a seamless experience</li>
-            <li>Carefully selected map sources that provide exceptional detail and clarity</li>
-        </ul>
-        
-        <div style="margin-top: 15px; padding: 10px; border-radius: 5px; background-color: rgba(30, 144, 255, 0.2); color: white;">
-            <p><strong>Tip:</strong> Use the layer control panel in the top-right corner of the map to toggle between different basemaps and overlays!</p>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_ABOUT_MAPS_HTML, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     run_artistic_map_demo()
\ No newline at end of file
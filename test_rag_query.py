@@ -0,0 +1,32 @@
+
+import unittest
+import pandas as pd
+import rag_query
+
+class TestProcessDatasetForRag(unittest.TestCase):
+    def test_numeric_columns_get_stats(self):
+        df = pd.DataFrame({'city': ['Paris', 'Oslo'], 'temperature': [12.5, 4.0]})
+
+        text = rag_query.process_dataset_for_rag(df)[0].page_content
+
+        self.assertIn("Statistical summary:", text)
+        self.assertIn("Column temperature - min: 4.0, max: 12.5", text)
+        self.assertNotIn("Column city", text)
+
+    def test_no_numeric_columns(self):
+        # A text-only dataset has nothing to aggregate but still gets a document
+        df = pd.DataFrame({'a': ['x', 'y']})
+
+        docs = rag_query.process_dataset_for_rag(df)
+
+        self.assertEqual(len(docs), 1)
+        self.assertTrue(docs[0].page_content.endswith("Statistical summary:"))
+
+    def test_empty_dataframe(self):
+        docs = rag_query.process_dataset_for_rag(pd.DataFrame())
+
+        self.assertEqual(len(docs), 1)
+        self.assertIn("Dataset with 0 rows and 0 columns.", docs[0].page_content)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,15 +8,24 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 from typing import List, Dict, Any, Optional
 import tempfile
 import io
+from functools import lru_cache
+
+# Embedding model used for all vector stores
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 
 # Initialize embedding model
+@lru_cache(maxsize=1)
 def get_embedding_model():
     """
-    Initialize and return the embedding model
+    Initialize and return the embedding model (loaded once per process)
     """
+    # All splits go through SentenceTransformer.encode as one batched call
+    encode_kwargs = {"batch_size": 64, "normalize_embeddings": True, "show_progress_bar": False}
+    
     return HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2",
-        model_kwargs={"device": "cpu"}
+        model_name=EMBEDDING_MODEL_NAME,
+        model_kwargs={"device": "cpu"},
+        encode_kwargs=encode_kwargs
     )
 
 # Initialize Chroma vector store